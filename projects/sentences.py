@@ -4,8 +4,9 @@ Copyright (c) 2021 IdmFoundInHim, under MIT License
 """
 __all__ = ["ss_projects"]
 
-from collections.abc import Iterable
-from typing import Sequence, cast
+from collections.abc import Collection, Iterable
+from functools import lru_cache
+from typing import cast
 
 from frozendict import frozendict
 from spotipy import Spotify, SpotifyPKCE
@@ -17,7 +18,11 @@ from streamsort import (
 )
 from streamsort.types import Mob, Query, State
 
-from .utilities import categorize_projects, single_in_album
+from .utilities import (
+    categorize_projects,
+    single_in_album,
+    track_keys,
+)
 
 
 def ss_projects(subject: State, query: Query) -> State:
@@ -45,30 +50,29 @@ def ss_projects(subject: State, query: Query) -> State:
     return State(api, Mob(frozendict(out_mob)), subject[2])
 
 
-def _divide(tracks: Iterable[Mob]) -> list[dict]:
+def _divide(tracks: Iterable[Mob]) -> Collection[dict]:
     albums = {}
     for track in tracks:
         try:
             album_id: str = track["album"]["id"]
         except KeyError:
             raise SimplifiedObjectError
-        if existing_album := albums.get(album_id):
-            albums[album_id]["objects"] = existing_album["objects"] + [track]
-        else:
-            albums[album_id] = {
+        if (album := albums.get(album_id)) is None:
+            album = albums[album_id] = {
                 "type": "ss",
                 "name": track["album"]["name"],
                 "root_album": track["album"],
                 # Add? # 'artists': track['album']['artists']
-                "objects": [track],
+                "objects": [],
             }
-    return list(albums.values())
+        album["objects"].append(track)
+    return albums.values()
 
 
-def _filter_singles(api: Spotify, projects: Sequence[dict]) -> list[Mob]:
+def _filter_singles(api: Spotify, projects: Collection[dict]) -> list[Mob]:
     for project in projects:
         # Remove duplicates and put in order
-        project_ids = [t["id"] for t in project["objects"]]
+        project_ids = {t["id"] for t in project["objects"]}
         # Adding the following check assumes that projects are in order.
         # It speeds up processing of playlists with few duplicates (that
         # is, most practical use cases) by ~20x. This optimization has
@@ -80,20 +84,27 @@ def _filter_singles(api: Spotify, projects: Sequence[dict]) -> list[Mob]:
         try:
             project["objects"] = [
                 t
-                for t in results_generator(
-                    cast(SpotifyPKCE, api.auth_manager),
-                    cast(
-                        dict,
-                        api.album_tracks(project["root_album"]["uri"]),
-                    ),
-                )
+                for t in _album_tracks(api, project["root_album"]["uri"])
                 if t["id"] in project_ids
             ]
         except AttributeError:
             pass
     project_list, singles, albums = categorize_projects(projects)
-    for single in singles:
-        for album in albums:
-            if single_in_album(cast(Mob, single), cast(Mob, album)):
-                project_list.remove(single)
-    return [Mob(frozendict(d)) for d in project_list]
+    album_keys = [track_keys(album["objects"]) for album in albums]
+    subsumed = {
+        id(single)
+        for single in singles
+        if any(single_in_album(cast(Mob, single), k) for k in album_keys)
+    }
+    return [Mob(frozendict(d)) for d in project_list if id(d) not in subsumed]
+
+
+@lru_cache(maxsize=256)
+def _album_tracks(api: Spotify, album_uri: str) -> tuple[Mob, ...]:
+    # Cached per session, since repeat runs often revisit the same albums
+    return tuple(
+        results_generator(
+            cast(SpotifyPKCE, api.auth_manager),
+            cast(dict, api.album_tracks(album_uri)),
+        )
+    )
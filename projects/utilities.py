@@ -2,7 +2,7 @@
 
 Copyright (c) 2021 IdmFoundInHim, under MIT License
 """
-from collections.abc import Sequence
+from collections.abc import Collection, Iterable, Set
 from itertools import zip_longest
 from collections.abc import Mapping
 
@@ -13,20 +13,16 @@ from .constants import SINGLE_MAX_MS, SINGLE_MAX_TRACKS
 
 
 def categorize_projects(
-    projects: Sequence[Mapping],
+    projects: Collection[dict],
 ) -> tuple[list[dict], list[dict], list[dict]]:
     project_list = list[dict]()
     singles, albums = list[dict](), list[dict]()
     for project in projects:
-        if (
-            len(project["objects"]) <= SINGLE_MAX_TRACKS
-            and sum(t["duration_ms"] for t in project["objects"])
-            <= SINGLE_MAX_MS
-        ):
-            project = {**project, "length_class": "single"}
+        if _is_single(project["objects"]):
+            project["length_class"] = "single"
             singles.append(project)
         else:
-            project = {**project, "length_class": "album"}
+            project["length_class"] = "album"
             albums.append(project)
         project_list.append(project)
     if len(project_list) and len(albums):
@@ -36,6 +32,17 @@ def categorize_projects(
     return project_list, singles, albums
 
 
+def _is_single(tracks: Collection[Mapping]) -> bool:
+    if len(tracks) > SINGLE_MAX_TRACKS:
+        return False
+    total_ms = 0
+    for track in tracks:
+        total_ms += track["duration_ms"]
+        if total_ms > SINGLE_MAX_MS:
+            return False
+    return True
+
+
 def song_presumed_eq(song1: Mob, song2: Mob) -> bool:
     return song1["name"] == song2["name"] and all(
         mob_eq(*artists)
@@ -45,16 +52,16 @@ def song_presumed_eq(song1: Mob, song2: Mob) -> bool:
     )
 
 
-def single_in_album(single: Mob, album: Mob) -> bool:
-    album_tracks = {t["name"]: t["artists"] for t in album["objects"]}
-    for track in single["objects"]:
-        if not all(
-            mob_eq(*artists)
-            for artists in zip_longest(
-                track["artists"],
-                album_tracks.get(track["name"], []),
-                fillvalue={"uri": ""},
-            )
-        ):
-            return False
-    return True
+TrackKey = tuple[str, tuple[str, ...]]
+
+
+def track_keys(tracks: Iterable[Mob]) -> set[TrackKey]:
+    """Summarize tracks as (name, sorted artist uris) for comparison"""
+    return {
+        (t["name"], tuple(sorted(a["uri"] for a in t["artists"])))
+        for t in tracks
+    }
+
+
+def single_in_album(single: Mob, album_keys: Set[TrackKey]) -> bool:
+    return track_keys(single["objects"]) <= album_keys
@@ -60,9 +60,8 @@ def ss_shuffle(subject: State, query: Query):
         # raise UnsupportedQueryError('The query was not list-like')
     random.shuffle(playlist)
     try:
-        ss_remove(subject, subject.mob)
-        ss_add(subject, Mob({"objects": playlist, "type": "ss"}))
+        subject = ss_remove(subject, subject.mob)
+        return ss_add(subject, Mob({"objects": playlist, "type": "ss"}))
     except UnsupportedVerbError as err:
         raise verb_error from err
         # raise UnsupportedVerbError('The subject was not editable') from err
-    return ss_open(subject, subject.mob["uri"])
@@ -4,61 +4,108 @@ Copyright (c) 2021 IdmFoundInHim, under MIT License
 """
 __all__ = ["liked_songs_cache_check"]
 
-import json
+import mmap
+import os
+import time
 from collections.abc import Mapping
 from datetime import datetime as dt
 from typing import Any, cast
 
 from spotipy import Spotify, SpotifyPKCE
 
-from .utilities import results_generator
+from ._constants import LIKED_SONGS_CACHE_PATH
+from ._json import dumps, loads
+from .utilities import results_prefetch
 
+CACHE_MAX_AGE_S = 7 * 24 * 60 * 60
+# When this process last confirmed each cache build, keyed by as_of_epoch
+_VERIFIED_EPOCHS: dict[float, float] = {}
 
-def liked_songs_cache_check(api: Spotify) -> dict[str, Any]:
+
+def liked_songs_cache_check(
+    api: Spotify, max_age_s: float = 0, force_refresh: bool = False
+) -> dict[str, Any]:
     """Get a dict of the cached liked songs list, updating if needed
 
+    A cache built or confirmed against Spotify's liked songs total within
+    the last `max_age_s` seconds is returned without any API call; older
+    caches are checked against the total again.
+    `force_refresh` rebuilds the cache regardless of age.
+
     All fields are calculated from saved *tracks*, so an album or artist
     is included with even one associated song.
 
     Fields:
 
-    - `'track'`: list of track ids
-    - `'album'`: list of album ids
-    - `'artist'`: list of artist ids
+    - `'track'`: frozenset of track ids
+    - `'album'`: frozenset of album ids
+    - `'artist'`: frozenset of artist ids
     - `'total'`: int, number of liked songs
     - `'as_of'`: datetime last updated
+    - `'as_of_epoch'`: float, `'as_of'` as seconds since the epoch
     """
     try:
-        with open(".cache/likedsongs.json") as cache:
-            cached = json.load(cache)
+        cached = _read_json(LIKED_SONGS_CACHE_PATH)
     except FileNotFoundError:
-        cached = {"as_of": "1970-01-01T00:00:00"}
-    latest = cast(dict, api.current_user_saved_tracks())
-    if (dt.now() - dt.fromisoformat(cached["as_of"])).days > 6 or latest[
-        "total"
-    ] != cached["total"]:
-        return _liked_songs_cache_save(
-            cast(SpotifyPKCE, api.auth_manager), latest
-        )
-    return cached
+        cached = {"as_of": "1970-01-01T00:00:00", "as_of_epoch": 0}
+    now = time.time()
+    as_of_epoch = cached.get("as_of_epoch", 0)
+    verified_epoch = _VERIFIED_EPOCHS.get(as_of_epoch, as_of_epoch)
+    if not force_refresh and now - verified_epoch < max_age_s:
+        return _liked_songs_frozen(cached)
+    if not force_refresh and now - as_of_epoch < CACHE_MAX_AGE_S:
+        # A one-item page is enough to read the total
+        latest = cast(dict, api.current_user_saved_tracks(limit=1))
+        if latest["total"] == cached["total"]:
+            _VERIFIED_EPOCHS[as_of_epoch] = now
+            return _liked_songs_frozen(cached)
+    page_zero = cast(dict, api.current_user_saved_tracks(limit=50))
+    return _liked_songs_frozen(
+        _liked_songs_cache_save(cast(SpotifyPKCE, api.auth_manager), page_zero)
+    )
 
 
 def _liked_songs_cache_save(
     auth: SpotifyPKCE, page_zero: Mapping[str, Any]
-) -> dict[str, str]:
+) -> dict[str, Any]:
     pending = {}
     pending["total"] = page_zero["total"]
     pending["as_of"] = dt.now().isoformat()
+    pending["as_of_epoch"] = time.time()
     tracks, albums, artists = set(), set(), set()
-    for result in results_generator(auth, page_zero):
+    # Keep only the ids so full track objects don't pile up in memory
+    for result in results_prefetch(auth, page_zero):
         track = result["track"]
         tracks.add(track["id"])
         albums.add(track["album"]["id"])
-        for artist in track["artists"]:
-            artists.add(artist["id"])
-    pending["track"] = list(tracks)
-    pending["album"] = list(albums)
-    pending["artist"] = list(artists)
-    with open(".cache/likedsongs.json", "w") as cache:
-        json.dump(pending, cache)
+        artists.update(a["id"] for a in track["artists"])
+    # Sets are encoded via default=list, one list at a time while dumping
+    pending["track"] = tracks
+    pending["album"] = albums
+    pending["artist"] = artists
+    _atomic_write_json(LIKED_SONGS_CACHE_PATH, pending)
     return pending
+
+
+def _liked_songs_frozen(liked: dict[str, Any]) -> dict[str, Any]:
+    for mobname in ("track", "album", "artist"):
+        liked[mobname] = frozenset(liked[mobname])
+    return liked
+
+
+def _read_json(path: str) -> Any:
+    # Parse straight from the mapped file rather than a read() copy
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return loads(view)
+
+
+def _atomic_write_json(path: str, obj: Any):
+    # Write beside the target and swap in so a crash can't truncate it
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb", buffering=1 << 16) as file:
+        file.write(dumps(obj, default=list))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
@@ -9,4 +9,5 @@ notify_user = print
 
 def confirm_action(message: str) -> bool:
     """Basic (Y/n)? wrapper for `input`"""
-    return input(message)[0:1] in "Yy"
+    answer = input(message)
+    return not answer or answer.startswith(("Y", "y"))
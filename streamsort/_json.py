@@ -0,0 +1,26 @@
+""" JSON encoding for StreamSort
+
+Copyright (c) 2021 IdmFoundInHim, under MIT License
+
+Uses orjson when it is installed, otherwise the standard library. Both
+functions work with bytes, matching orjson, and `loads` also accepts a
+memoryview.
+"""
+__all__ = ["dumps", "loads"]
+
+try:
+    from orjson import dumps, loads
+except ImportError:
+    import json
+    from collections.abc import Callable
+    from typing import Any
+
+    def dumps(obj: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+        """Serialize obj as compact JSON bytes"""
+        return json.dumps(obj, default=default, separators=(",", ":")).encode()
+
+    def loads(data: bytes | bytearray | memoryview | str) -> Any:
+        """Deserialize JSON from text or a bytes-like object"""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
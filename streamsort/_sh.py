@@ -75,17 +75,26 @@ Implementation:
 __all__ = ["shell", "process_line", "login", "logout"]
 
 import os
-import itertools
 from collections.abc import Callable, Iterator, Mapping
+from itertools import islice
 from typing import cast
 
 from frozendict import frozendict
+from more_itertools import peekable
 import requests.exceptions
 from spotipy import Spotify, SpotifyException, SpotifyPKCE
 
 from ._constants import CACHE_PATH, CLIENT_ID, REDIRECT_URI, SCOPE
 from .errors import NoResultsError
-from .sentences import ss_add, ss_all, ss_new, ss_open, ss_play, ss_remove
+from .sentences import (
+    _SS_ME,
+    ss_add,
+    ss_all,
+    ss_new,
+    ss_open,
+    ss_play,
+    ss_remove,
+)
 from .types import Mob, Query, Sentence, State
 from .utilities import iter_mob_track, results_generator, str_mob
 
@@ -110,6 +119,7 @@ def login() -> State:
 
 def logout() -> int:
     """Removes cache, returning a truthy value only if removal fails"""
+    _SS_ME.clear()
     try:
         os.remove(CACHE_PATH)
         return 0
@@ -132,7 +142,13 @@ def shell(extensions: dict[str, Sentence]) -> int:
     )
     status = IDLE
     state = login()
-    while (line := input(str_mob(state.mob) + " > ")) != "exit":
+    prompt_mob, prompt = None, ""
+    while True:
+        # Holding the mob keeps the identity check valid between lines
+        if state.mob is not prompt_mob:
+            prompt_mob, prompt = state.mob, str_mob(state.mob) + " > "
+        if (line := input(prompt)) == "exit":
+            break
         status = WORK
         if line[:6] == "logout":
             if logout():
@@ -173,32 +189,19 @@ QueryProcess = Callable[[State, Iterator[str], Mapping[str, Sentence]], Query]
 def process_line(
     state: State, tokens: Iterator[str], sentences: Mapping[str, Sentence]
 ) -> tuple[Sentence, Query]:
-    reserved_control: dict[str | None, Processor] = {
-        "in": _process_line_in,
-        "after": process_line,
-        "track": _process_line_track_load,
-        "nom": lambda a, b, c: (_identity_state, Mob({})),
-        None: lambda a, b, c: (_identity_state, Mob({})),
-    }
-    branch_control: dict[str | None, QueryProcess | str] = {
-        "in": "Parameter may not start with 'in'. Perhaps use 'nom in'",
-        "after": _process_line_after,
-        "track": _process_line_track,
-        "nom": _process_line_nom,
-    }
-
     token = next(tokens, None)
-    if processor := reserved_control.get(token):
+    if processor := _RESERVED_CONTROL.get(token):
         return processor(state, tokens, sentences)
     if sentence := sentences.get(cast(str, token)):
-        tokens_t, branch_tokens = itertools.tee(tokens)
-        branch_token = next(branch_tokens, None)
-        if control := cast(QueryProcess, branch_control.get(branch_token)):
+        tokens = peekable(tokens)
+        branch_token = tokens.peek(None)
+        if control := cast(QueryProcess, _BRANCH_CONTROL.get(branch_token)):
+            next(tokens)  # Controls take the tokens after the branch token
             try:
                 return (sentence, control(state, tokens, sentences))
             except TypeError as err:
                 raise ValueError(control) from err
-        return (sentence, " ".join(tokens_t))
+        return (sentence, " ".join(tokens))
     if substate := state.subshells.get(cast(str, token)):
         subsh_name, token = token, next(tokens, None)
         if token:
@@ -242,24 +245,16 @@ def _process_line_track(
 ) -> Mob:
     del sentences
     track_num = next(tokens)
-    try:
-        track_num = int(track_num)
-        track = state.mob["tracks"]["items"][track_num - 1]
-        return cast(Mob, state.api.track(track.get("track", track)["id"]))
-    except KeyError as err:
-        raise ValueError(f"'{str(state)}' does not contain tracks") from err
-    except IndexError:
-        all_tracks = results_generator(
-            cast(SpotifyPKCE, state.api.auth_manager), state.mob["tracks"]
-        )
-        targeted_track_num = 1
-        while targeted_track_num != track_num and next(all_tracks, False):
-            targeted_track_num += 1
-        if targeted_track := next(all_tracks, None):
-            targeted_track = targeted_track.get("track", targeted_track)["id"]
-            return cast(Mob, state.api.track(targeted_track))
-    except ValueError:
-        pass
+    if track_num.isdecimal() and (track_index := int(track_num) - 1) >= 0:
+        tracks = state.mob.get("tracks")
+        if tracks is None or tracks.get("items") is None:
+            raise ValueError(f"'{str(state)}' does not contain tracks")
+        if track_index < len(tracks["items"]):
+            track = tracks["items"][track_index]
+            return cast(Mob, state.api.track(track.get("track", track)["id"]))
+        track = _process_line_track_at(state, tracks, track_index)
+        if track:
+            return cast(Mob, state.api.track(track.get("track", track)["id"]))
     track_nom = " ".join(tokens)
     if track_num != "nom":
         track_nom = f"{track_num} {track_nom}".lower()
@@ -278,6 +273,27 @@ def _process_line_track(
     return cast(Mob, state.api.track(track_obj["id"]))
 
 
+def _process_line_track_at(
+    state: State, tracks: Mapping, track_index: int
+) -> Mob | None:
+    # Request the one-item page at the index instead of paging up to it
+    match state.mob.get("type"):
+        case "playlist":
+            page = state.api.playlist_items(
+                state.mob["id"], limit=1, offset=track_index
+            )
+        case "album":
+            page = state.api.album_tracks(
+                state.mob["id"], limit=1, offset=track_index
+            )
+        case _:
+            all_tracks = results_generator(
+                cast(SpotifyPKCE, state.api.auth_manager), tracks
+            )
+            return next(islice(all_tracks, track_index, None), None)
+    return next(iter(cast(dict, page)["items"]), None)
+
+
 def _process_line_track_load(
     state: State, tokens: Iterator[str], sentences: Mapping[str, Sentence]
 ) -> tuple[Sentence, Query]:
@@ -300,15 +316,17 @@ def _process_line_nom(
     return " ".join(tokens)
 
 
+def _process_line_noop(
+    state: State, tokens: Iterator[str], sentences: Mapping[str, Sentence]
+) -> tuple[Sentence, Query]:
+    del state, tokens, sentences
+    return (_identity_state, Mob({}))
+
+
 def _set_subshell(subsh_name: str, subsh_state: State) -> Sentence:
     def set_subshell(subject: State, query: Query) -> State:
         del query
-        old_subshells = {
-            k: subject.subshells[k]
-            for k in subject.subshells
-            if k != subsh_name
-        }
-        subshells = frozendict(old_subshells | {subsh_name: subsh_state})
+        subshells = subject.subshells.set(subsh_name, subsh_state)
         return State(subject[0], subject[1], subshells)
 
     return set_subshell
@@ -317,3 +335,18 @@ def _set_subshell(subsh_name: str, subsh_state: State) -> Sentence:
 def _identity_state(state: State, query: Query) -> State:
     del query
     return state
+
+
+_RESERVED_CONTROL: dict[str | None, Processor] = {
+    "in": _process_line_in,
+    "after": process_line,
+    "track": _process_line_track_load,
+    "nom": _process_line_noop,
+    None: _process_line_noop,
+}
+_BRANCH_CONTROL: dict[str | None, QueryProcess | str] = {
+    "in": "Parameter may not start with 'in'. Perhaps use 'nom in'",
+    "after": _process_line_after,
+    "track": _process_line_track,
+    "nom": _process_line_nom,
+}
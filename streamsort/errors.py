@@ -19,19 +19,14 @@ class UnsupportedVerbError(ValueError):
     """The Subject did not allow the attempted Sentence"""
 
     def __init__(self, subject: str, verb: str):
-        super().__init__()
-        self.args = (
-            f'{subject} does not allow you to use "{verb}"',
-            *self.args,
-        )
+        super().__init__(f'{subject} does not allow you to use "{verb}"')
 
 
 class UnsupportedQueryError(ValueError):
     """A Sentence was attempted with a disallowed Query"""
 
     def __init__(self, verb: str, query: str):
-        super().__init__()
-        self.args = (f'"{verb}" is unable to process {query}', *self.args)
+        super().__init__(f'"{verb}" is unable to process {query}')
 
 
 class UnexpectedResponseException(Exception):
@@ -14,16 +14,19 @@ __all__ = [
     "ss_remove",
 ]
 
+import re
 from collections.abc import Callable, Iterator, Mapping
-from itertools import tee
+from functools import lru_cache
+from itertools import chain, compress, islice, tee
 from typing import cast
+from weakref import WeakKeyDictionary
 
 from frozendict import frozendict
 from more_itertools import chunked, roundrobin
 from spotipy import Spotify, SpotifyPKCE
 
 from ._cache import liked_songs_cache_check
-from ._constants import MOB_GET_FUNCTIONS, MOBNAMES, NUMSUGGESTIONS
+from ._constants import MOB_URI_PREFIX, MOBNAMES, NUMSUGGESTIONS
 from .errors import NoResultsError, UnsupportedQueryError, UnsupportedVerbError
 from ._io import confirm_action, notify_user
 from .types import Album, Artist, Mob, Playlist, State, Track, Query
@@ -37,11 +40,16 @@ from .utilities import (
 )
 
 LIMIT = 5
+LIKED_SONGS_MAX_AGE_S = 60
+SEARCH_TYPES = ",".join(MOBNAMES)
+MOB_TAG = re.compile(rf"\b({'|'.join(MOBNAMES)}):")
 TypeSpecificSearch = Callable[[State, str], Mob | None]
 MultipleChoiceFunction = Callable[[Iterator[Mob]], Mob | None]
 
 IO_CONFIRM = cast(Callable[[str], bool], confirm_action)
 IO_NOTIFY = cast(Callable[[str], None], notify_user)
+# Current user of each auth manager, cleared on logout
+_SS_ME: WeakKeyDictionary[SpotifyPKCE, Mob] = WeakKeyDictionary()
 
 
 def io_inject(
@@ -133,11 +141,11 @@ def ss_add(subject: State, query: Query) -> State:
     if not query:
         # raise UnsupportedQueryError('"add" requires a query')
         raise UnsupportedQueryError("add", "")
+    api = subject.api
     if subject.mob["type"] == "playlist":
-        _ss_add_to_playlist(
-            subject.api, subject.mob, ss_open(subject, query).mob
-        )
-        return ss_open(subject, subject.mob["uri"])
+        _ss_add_to_playlist(api, subject.mob, ss_open(subject, query).mob)
+        playlist = cast(Mob, api.playlist(subject.mob["id"]))
+        return State(api, playlist, subject[2])
     elif subject.mob.get("objects") is not None:
         return ss_open(
             subject, _ss_add_to_ss(subject.mob, ss_open(subject, query).mob)
@@ -161,11 +169,11 @@ def ss_remove(subject: State, query: Query) -> State:
     if not query:
         # raise UnsupportedQueryError('"remove" requires a query')
         raise UnsupportedQueryError("remove", "")
+    api = subject.api
     if subject.mob["type"] == "playlist":
-        _ss_remove_from_playlist(
-            subject.api, subject.mob, ss_open(subject, query).mob
-        )
-        return ss_open(subject, subject.mob["uri"])
+        _ss_remove_from_playlist(api, subject.mob, ss_open(subject, query).mob)
+        playlist = cast(Mob, api.playlist(subject.mob["id"]))
+        return State(api, playlist, subject[2])
     elif subject.mob.get("objects") is not None:
         return ss_open(
             subject,
@@ -183,16 +191,17 @@ def ss_play(subject: State, query: Query) -> State:
     """
     if not query:
         query = subject.mob
+    api = subject.api
     to_play = ss_open(subject, query).mob
     if subject.mob["type"] in ["playlist", "album", "show"] and mob_in_mob(
-        subject.api, to_play, subject.mob
+        api, to_play, subject.mob
     ):
-        _ss_play_in_context(subject.api, subject.mob, to_play)
+        _ss_play_in_context(api, subject.mob, to_play)
     else:
         uri_list = list(
-            iter_mob_uri(cast(SpotifyPKCE, subject.api.auth_manager), to_play)
+            iter_mob_uri(cast(SpotifyPKCE, api.auth_manager), to_play)
         )
-        subject.api.start_playback(uris=uri_list)
+        api.start_playback(uris=uri_list)
     return subject
 
 
@@ -209,7 +218,7 @@ def ss_all(subject: State, query: Query) -> State:
     ss_object = Mob(
         frozendict(
             name=str_mob(query) if isinstance(query, Mapping) else query,
-            owner=subject.api.me(),
+            owner=_ss_me(subject.api),
             # Static:
             collaborative=False,
             description=None,
@@ -231,47 +240,44 @@ def ss_new(subject: State, query: Query) -> State:
     if not query:
         # raise UnsupportedQueryError('"new" requires a query')
         raise UnsupportedQueryError("new", "")
+    api = subject.api
     name = str_mob(query) if isinstance(query, Mapping) else query
     playlist_id = cast(
-        str,
-        subject.api.user_playlist_create(
-            cast(Mob, subject.api.me())["id"], name, False
-        ),
+        str, api.user_playlist_create(_ss_me(api)["id"], name, False)
     )
     return ss_open(subject, playlist_id)
 
 
+@lru_cache(maxsize=256)
 def _ss_open_process_query(query: str) -> TypeSpecificSearch:
     if as_uri(query):
         return _ss_open_uri
-    tags = {t: (t + ":" in query) for t in MOBNAMES}
-    if tags["playlist"]:
+    tags = set(MOB_TAG.findall(query))
+    if "playlist" in tags:
         return _ss_open_playlist
-    if tags["track"] and (tags["album"] or tags["artist"]):
+    if "track" in tags and ("album" in tags or "artist" in tags):
         return _ss_open_track(variation=_ss_open_firstresult)
-    if tags["track"]:
+    if "track" in tags:
         return _ss_open_track(variation=_ss_open_userinput)
-    if tags["album"] and tags["artist"]:
+    if "album" in tags and "artist" in tags:
         return _ss_open_album(variation=_ss_open_firstresult)
-    if tags["album"]:
+    if "album" in tags:
         return _ss_open_album(variation=_ss_open_userinput)
-    if tags["artist"]:
+    if "artist" in tags:
         return _ss_open_artist(variation=_ss_open_firstresult)
     return _ss_open_general
 
 
 def _ss_open_uri(subject: State, query: str) -> Mob | None:
     api = subject[0]
-    _, mobtype, mobid = as_uri(query).split(":")
-    try:
-        return MOB_GET_FUNCTIONS[mobtype](api, mobid)
-    except KeyError:
-        return None
+    uri = as_uri(query).removeprefix(MOB_URI_PREFIX)
+    mobtype, _, mobid = uri.partition(":")
+    return _ss_open_fullobject(api, mobtype, mobid)
 
 
 def _ss_open_general(subject: State, query: str) -> Mob | None:
     api = subject[0]
-    results = cast(dict, api.search(query, LIMIT, type=",".join(MOBNAMES)))
+    results = cast(dict, api.search(query, LIMIT, type=SEARCH_TYPES))
     results = {
         x: _ss_open_familiar(subject, results[x + "s"], x)
         if x != "playlist"
@@ -290,11 +296,36 @@ def _ss_open_general(subject: State, query: str) -> Mob | None:
         priority_results, pr_original = tee(roundrobin(*result_gens))
         if first_result := next(priority_results, None):
             if next(priority_results, None):
-                get_full_object = MOB_GET_FUNCTIONS[first_result["type"]]
-                return get_full_object(api, first_result["id"])
+                return _ss_open_searchresult(api, first_result)
             if user_select := _ss_open_userinput(pr_original):
-                get_full_object = MOB_GET_FUNCTIONS[user_select["type"]]
-                return get_full_object(api, user_select["id"])
+                return _ss_open_searchresult(api, user_select)
+    return None
+
+
+def _ss_open_searchresult(api: Spotify, result: Mob) -> Mob | None:
+    # Search returns full track and artist objects, but simplified
+    # albums and playlists that lack their tracks
+    if result["type"] in ("track", "artist"):
+        return result
+    return _ss_open_fullobject(api, result["type"], result["id"])
+
+
+def _ss_open_fullobject(api: Spotify, mobtype: str, mobid: str) -> Mob | None:
+    match mobtype:
+        case "track":
+            return cast(Mob, api.track(mobid))
+        case "album":
+            return cast(Mob, api.album(mobid))
+        case "artist":
+            return cast(Mob, api.artist(mobid))
+        case "playlist":
+            return cast(Mob, api.playlist(mobid))
+        case "episode":
+            return cast(Mob, api.episode(mobid))
+        case "show":
+            return cast(Mob, api.show(mobid))
+        case "user":
+            return cast(Mob, api.user(mobid))
     return None
 
 
@@ -308,15 +339,16 @@ def _ss_open_playlist(subject: State, query: str) -> Playlist | None:
     if num_results:
         result = api.playlist(next(results_familiar)["id"])
         return cast(Playlist | None, _ss_open_notifyuser(result))
-    results_f1, results_f2 = tee(next(results))
-    first_result = next(results_f1, None)
-    if first_result and all(
-        z[0] == z[1] for z in zip(first_result["name"], query)
+    results_owned = list(next(results))  # Filtered from the first page
+    first_result = results_owned[0] if results_owned else None
+    if first_result and (
+        first_result["name"].startswith(query)
+        or query.startswith(first_result["name"])
     ):
         result = api.playlist(first_result)
         return cast(Playlist | None, _ss_open_notifyuser(result))
     if first_result:
-        user_select = _ss_open_userinput(results_f2)
+        user_select = _ss_open_userinput(iter(results_owned))
         if user_select:
             return cast(Playlist | None, api.playlist(user_select["id"]))
     num_results, results_familiar = _ss_open_genlen(next(results))
@@ -333,22 +365,16 @@ def _ss_open_playlist(subject: State, query: str) -> Playlist | None:
 def _ss_open_playlist_familiar(
     subject: State, results: dict
 ) -> Iterator[Iterator[Playlist]]:
-    api = subject[0]
+    api, subject_mob = subject[0], subject[1]
     auth = cast(SpotifyPKCE, api.auth_manager)
+    items = results["items"]
+    subject_id = subject_mob.get("id", False)
+    yield (cast(Playlist, p) for p in items if p["id"] == subject_id)
+    usrid = _ss_me(api)["id"]
+    yield (cast(Playlist, p) for p in items if p["owner"]["id"] == usrid)
     yield (
         cast(Playlist, p)
-        for p in results['items']
-        if p["id"] == subject[1].get("id", False)
-    )
-    usrid = cast(dict, api.me())["id"]
-    yield (
-        cast(Playlist, p)
-        for p in results['items']
-        if p["owner"]["id"] == usrid
-    )
-    yield (
-        cast(Playlist, p)
-        for p in results['items']
+        for p in items
         if api.playlist_is_following(p["id"], [usrid])
     )
     yield cast(Iterator[Playlist], results_generator(auth, results))
@@ -380,7 +406,7 @@ def _ss_open_album(variation: MultipleChoiceFunction) -> TypeSpecificSearch:
     def get_album(subject: State, query: str) -> Album | None:
         api = subject[0]
         results = cast(dict, api.search(query, LIMIT, type="album"))["albums"]
-        results = _ss_open_familiar(subject, results, MOBNAMES[0])
+        results = _ss_open_familiar(subject, results, "album")
         for unconfidence, results in enumerate(results):
             num_results, results = _ss_open_genlen(results)
             if num_results == 1 and unconfidence < 3:
@@ -402,7 +428,7 @@ def _ss_open_artist(variation: MultipleChoiceFunction) -> TypeSpecificSearch:
         results = cast(dict, api.search(query, LIMIT, type="artist"))[
             "artists"
         ]
-        results = _ss_open_familiar(subject, results, MOBNAMES[0])
+        results = _ss_open_familiar(subject, results, "artist")
         for unconfidence, results in enumerate(results):
             if unconfidence == 2:
                 pass
@@ -421,53 +447,44 @@ def _ss_open_artist(variation: MultipleChoiceFunction) -> TypeSpecificSearch:
 
 
 def _ss_open_genlen(generator: Iterator) -> tuple[int, Iterator]:
-    scan_copy, return_copy = tee(generator)
-    one_result = next(scan_copy, None)
-    if next(scan_copy, None) is not None:
-        val = 2
-    else:
-        val = int(one_result is not None)
-    del scan_copy
-    return val, return_copy
+    # Only 0, 1, or "more than 1" matters, so look at most 2 ahead
+    head = list(islice(generator, 2))
+    return len(head), chain(head, generator)
 
 
 def _ss_open_familiar(
     subject: State, results: dict, mobname: str
 ) -> Iterator[Iterator[Mob]]:
-    api = subject[0]
+    api, subject_mob = subject[0], subject[1]
     auth = cast(SpotifyPKCE, api.auth_manager)
-    yield (
-        r
-        for r in results['items']
-        if mob_in_mob(api, r, subject[1])
-    )
-    artists_ungrouped = []
-    indices_filtered = set()
-    for index, result in enumerate(results['items']):
-        artists_ungrouped += [(index, artist['id']) for artist in result.get('artists', [result])]
-    indices_all, artist_ids = zip(*artists_ungrouped)
-    following_bools = []
+    items = results["items"]
+    yield (r for r in items if mob_in_mob(api, r, subject_mob))
+    result_artist_ids = [
+        [artist["id"] for artist in result.get("artists", [result])]
+        for result in items
+    ]
+    # Each artist is checked once, however many results credit them
+    artist_ids = list(dict.fromkeys(chain.from_iterable(result_artist_ids)))
+    followed_ids = set()
     for fifty_artist_ids in chunked(artist_ids, 50):
-        following_bools += api.current_user_following_artists(fifty_artist_ids)
-    for secondary_index, following in enumerate(following_bools):
-        if following:
-            indices_filtered.add(indices_all[secondary_index])
-    yield (
-        results['items'][index]
-        for index in indices_filtered
-    )
-    liked_songs = liked_songs_cache_check(api)
+        followed_ids.update(
+            compress(
+                fifty_artist_ids,
+                api.current_user_following_artists(fifty_artist_ids),
+            )
+        )
     yield (
         r
-        for r in results['items']
-        if r["id"] in liked_songs[mobname]
+        for r, r_artist_ids in zip(items, result_artist_ids)
+        if not followed_ids.isdisjoint(r_artist_ids)
     )
+    liked_songs = liked_songs_cache_check(api, LIKED_SONGS_MAX_AGE_S)
+    liked_ids, liked_artist_ids = liked_songs[mobname], liked_songs["artist"]
+    yield (r for r in items if r["id"] in liked_ids)
     yield (
         r
-        for r in results['items']
-        if any(
-            a in liked_songs["artist"] for a in r.get("artists") or [r["id"]]
-        )
+        for r, r_artist_ids in zip(items, result_artist_ids)
+        if not liked_artist_ids.isdisjoint(r_artist_ids)
     )
     yield results_generator(auth, results)
 
@@ -565,6 +582,14 @@ def _ss_play_in_context(api: Spotify, context: Mob, to_play: Mob):
             break
 
 
+def _ss_me(api: Spotify) -> Mob:
+    # Weakly keyed by auth manager, so dropped clients are not kept alive
+    auth = api.auth_manager
+    if (me := _SS_ME.get(auth)) is None:
+        me = _SS_ME[auth] = cast(Mob, api.me())
+    return me
+
+
 if __name__ == "__main__":
     from ._sh import login
 
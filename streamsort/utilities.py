@@ -10,17 +10,23 @@ __all__ = [
     "mob_eq",
     "mob_in_mob",
     "results_generator",
+    "results_prefetch",
     "str_mob",
     "state_only_api",
 ]
 
+import re
+import time
 from collections.abc import Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from threading import Lock
 from typing import cast
-from urllib import parse as urlparse
 from frozendict import frozendict
 
 from more_itertools import flatten
 import requests
+from requests.adapters import HTTPAdapter
 from spotipy import Spotify, SpotifyPKCE
 
 from ._constants import (
@@ -29,30 +35,39 @@ from ._constants import (
     MOB_URL_PREFIX,
     SPID_VALID_CHARS,
 )
+from ._json import loads
 from .types import Mob, State, Track
 
+_SESSION = requests.Session()  # Reuses connections across page requests
+_PAGE_ATTEMPTS = 3
+_PAGE_TIMEOUT_S = 30
+_MOB_URI = re.compile(
+    re.escape(MOB_URI_PREFIX)
+    + rf"(?:{'|'.join(MOBNAMES)}):[{SPID_VALID_CHARS}]*"
+)
+_MOB_URL_PATH = re.compile(
+    re.escape(MOB_URL_PREFIX) + r"(?:[^?#]*/)?([^/?#]*)/([^/?#]*)"
+)
+
 
 def as_uri(uri: str):
     """Returns the URI in standard format only if present"""
+    uri = uri.strip()
     if uri.startswith(MOB_URL_PREFIX):
-        try:
-            url = urlparse.urlparse(uri)
-        except ValueError:
+        if not (url_path := _MOB_URL_PATH.match(uri)):
             return ""
-        uri = MOB_URI_PREFIX + ":".join(url.path.split("/")[-2:])
-    uri_parts = uri.strip().split(":")
-    if (
-        len(uri_parts) == 3
-        and uri_parts[0] == "spotify"
-        and uri_parts[1] in MOBNAMES
-        and all(c in SPID_VALID_CHARS for c in uri_parts[2])
-    ):
+        uri = MOB_URI_PREFIX + ":".join(url_path.groups())
+    if _MOB_URI.fullmatch(uri):
         return uri
     return ""
 
 
+@lru_cache(maxsize=2)
 def get_header(oauth: str) -> dict:
-    """Returns header with given oauth for the Spotify API"""
+    """Returns header with given oauth for the Spotify API
+
+    The same dict is returned for repeated tokens, so do not modify it.
+    """
     return {
         "Accept": "application/json",
         "Content-Type": "application/json",
@@ -142,9 +157,9 @@ def results_generator(auth: SpotifyPKCE, page_zero: Mapping) -> Iterator[Mob]:
     header = get_header(auth.get_access_token())
     while nexturl := page["next"]:
         try:
-            page_r = requests.get(nexturl, headers=header)
+            page_r = _SESSION.get(nexturl, headers=header)
             page_r.raise_for_status()
-            page = page_r.json()
+            page = loads(page_r.content)
             yield from page["items"]
         except requests.exceptions.HTTPError:
             if "offset=1000" in nexturl:
@@ -157,36 +172,135 @@ def results_generator(auth: SpotifyPKCE, page_zero: Mapping) -> Iterator[Mob]:
             yield from page["items"]
 
 
-def state_only_api(api: Spotify):
-    return State(api, Mob({}), frozendict())
+def results_prefetch(
+    auth: SpotifyPKCE, page_zero: Mapping, workers: int = 8
+) -> Iterator[Mob]:
+    """Iterates over multi-page responses, fetching pages concurrently
 
+    Rather than following each page's `next` link, every remaining page
+    is requested up front by offset (using page_zero's `total`), up to
+    `workers` at a time. Items are still yielded in order. Only use this
+    when the items will not change during iteration; see
+    `results_generator`.
 
-_MOB_STRS = {
-    "track": '"{}" by {}{}',
-    "album": "*{}* by {}, {} songs",
-    "artist": "{}{}{}",
-    "playlist": "{}, {}{} songs",
-    "episode": '"{}" from *{}{}*',
-    "show": "*{}* from {}{}",
-    "user": "@{}{}{}",
-    "ss": ":{}{}{}",
-}
+    A 401 refreshes the token once for all workers, and a 429 waits out
+    `Retry-After`. Each page is tried up to three times, and each request
+    times out after `_PAGE_TIMEOUT_S` seconds.
+    """
+    try:
+        yield from page_zero["items"]
+        if not page_zero["next"]:
+            return
+        limit, total = page_zero["limit"], page_zero["total"]
+        first_offset = page_zero["offset"] + limit
+    except KeyError as err:
+        raise ValueError("DEVELOPER: Expected paging object") from err
+    # Spotify's query values are already encoded, so only offset changes
+    base_url, _, query = page_zero["next"].partition("?")
+    query = "&".join(
+        p for p in query.split("&") if not p.startswith("offset=")
+    )
+    page_urls = [
+        f"{base_url}?{query}&offset={offset}"
+        for offset in range(first_offset, total, limit)
+    ]
+    header = get_header(auth.get_access_token())
+    token_lock = Lock()
+    # A private session whose connection pool fits every worker, instead
+    # of sharing the module session across threads
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=workers))
+
+    def get_items(page_url: str) -> list[Mob]:
+        nonlocal header
+        for _ in range(_PAGE_ATTEMPTS):
+            sent_header = header
+            page_r = session.get(
+                page_url, headers=sent_header, timeout=_PAGE_TIMEOUT_S
+            )
+            if page_r.status_code == 401:
+                with token_lock:
+                    # Another worker may have refreshed it already
+                    if header is sent_header:
+                        fresh_token = auth.get_access_token(check_cache=False)
+                        header = get_header(fresh_token)
+            elif page_r.status_code == 429:
+                time.sleep(float(page_r.headers.get("Retry-After", 1)))
+            else:
+                break
+        page_r.raise_for_status()
+        return loads(page_r.content)["items"]
+
+    executor = ThreadPoolExecutor(workers)
+    try:
+        for items in executor.map(get_items, page_urls):
+            yield from items
+    finally:
+        # Don't download the remaining pages after an error
+        executor.shutdown(cancel_futures=True)
+        session.close()
+
+
+def state_only_api(api: Spotify):
+    return State(api, Mob({}), frozendict())
 
 
 def str_mob(mob: Mob):
     """Constructs display string of given Mob (dict)"""
-    mob_fields = [
-        mob.get("name", mob.get("display_name")),
-        mob["artists"][0]["name"]
-        if mob.get("artists")
-        else mob.get("show", mob.get("publisher", "")),
-        mob.get("total_tracks") or mob["tracks"]["total"]
-        if mob.get("tracks")
-        else mob["episodes"]["total"]
-        if mob.get("episodes")
-        else "",
-    ]
-    return _MOB_STRS[mob["type"]].format(*mob_fields)
+    return _MOB_STRS[mob["type"]](mob)
+
+
+def _str_track(track: Mob) -> str:
+    return f'"{track["name"]}" by {_str_first_artist(track)}'
+
+
+def _str_album(album: Mob) -> str:
+    return (
+        f"*{album['name']}* by {_str_first_artist(album)}, "
+        f"{album['total_tracks']} songs"
+    )
+
+
+def _str_artist(artist: Mob) -> str:
+    return artist["name"]
+
+
+def _str_playlist(playlist: Mob) -> str:
+    return f"{playlist['name']}, {playlist['tracks']['total']} songs"
+
+
+def _str_episode(episode: Mob) -> str:
+    # Simplified episodes leave out their show
+    show_name = episode.get("show", {}).get("name", "")
+    return f'"{episode["name"]}" from *{show_name}*'
+
+
+def _str_show(show: Mob) -> str:
+    return f"*{show['name']}* from {show['publisher']}"
+
+
+def _str_user(user: Mob) -> str:
+    return f"@{user['display_name']}"
+
+
+def _str_ss(ss: Mob) -> str:
+    return f":{ss.get('name')}"
+
+
+def _str_first_artist(mob: Mob) -> str:
+    return mob["artists"][0]["name"] if mob.get("artists") else ""
+
+
+_MOB_STRS = {
+    "track": _str_track,
+    "album": _str_album,
+    "artist": _str_artist,
+    "playlist": _str_playlist,
+    "episode": _str_episode,
+    "show": _str_show,
+    "user": _str_user,
+    "ss": _str_ss,
+}
 
 
 def _track_in_mob(auth: SpotifyPKCE, track: Mob, mob: Mob) -> bool: